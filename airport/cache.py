@@ -0,0 +1,16 @@
+import uuid
+
+from django.core.cache import cache
+
+GEO_CACHE_VERSION_KEY = "airport:geo_cache_version"
+GEO_CACHE_TIMEOUT = 60 * 60
+
+
+def get_geo_cache_version() -> str:
+    """return the current version of cached airport/city/country data"""
+    return cache.get_or_set(GEO_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def invalidate_geo_cache() -> None:
+    """make every cached airport/city/country response stale"""
+    cache.set(GEO_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
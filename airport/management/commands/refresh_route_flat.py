@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from airport.models import RouteFlat
+
+
+class Command(BaseCommand):
+    desc = "Refresh the route_flat materialized view"
+
+    def handle(self, *args, **options):
+        RouteFlat.refresh()
+        self.stdout.write(self.style.SUCCESS("route_flat refreshed"))
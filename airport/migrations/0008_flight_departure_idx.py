@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-15 17:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("airport", "0007_airplane_image"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["-departure_time", "-arrival_time", "id"],
+                name="flight_departure_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0 on 2026-10-15 17:24
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.datetime
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("airport", "0008_flight_departure_idx"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="airport",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="airport_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="city",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="city_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                django.db.models.functions.datetime.TruncDate("departure_time"),
+                name="flight_dep_date_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0 on 2026-10-15 17:25
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_booked_seats(apps, schema_editor):
+    Flight = apps.get_model("airport", "Flight")
+    Ticket = apps.get_model("airport", "Ticket")
+    tickets_count = (
+        Ticket.objects.filter(flight=OuterRef("pk"))
+        .order_by()
+        .values("flight")
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    Flight.objects.update(
+        booked_seats=Coalesce(
+            Subquery(tickets_count, output_field=models.IntegerField()), 0
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("airport", "0009_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flight",
+            name="booked_seats",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_booked_seats, migrations.RunPython.noop),
+    ]
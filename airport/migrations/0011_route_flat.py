@@ -0,0 +1,75 @@
+# Generated by Django 5.0 on 2026-10-15 17:26
+
+from django.db import migrations, models
+
+CREATE_ROUTE_FLAT = """
+CREATE MATERIALIZED VIEW route_flat AS
+SELECT
+    r.id,
+    r.distance,
+    s.id AS source_id,
+    s.name AS source_name,
+    sc.id AS source_city_id,
+    sc.name AS source_city_name,
+    scc.name AS source_country_name,
+    d.id AS destination_id,
+    d.name AS destination_name,
+    dc.id AS destination_city_id,
+    dc.name AS destination_city_name,
+    dcc.name AS destination_country_name
+FROM airport_route r
+JOIN airport_airport s ON s.id = r.source_id
+LEFT JOIN airport_city sc ON sc.id = s.closest_big_city_id
+LEFT JOIN airport_country scc ON scc.id = sc.country_id
+JOIN airport_airport d ON d.id = r.destination_id
+LEFT JOIN airport_city dc ON dc.id = d.closest_big_city_id
+LEFT JOIN airport_country dcc ON dcc.id = dc.country_id;
+
+CREATE UNIQUE INDEX route_flat_id_idx ON route_flat (id);
+CREATE INDEX route_flat_source_id_idx ON route_flat (source_id);
+CREATE INDEX route_flat_destination_id_idx ON route_flat (destination_id);
+"""
+
+DROP_ROUTE_FLAT = "DROP MATERIALIZED VIEW IF EXISTS route_flat;"
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("airport", "0010_flight_booked_seats"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_ROUTE_FLAT, DROP_ROUTE_FLAT),
+        migrations.CreateModel(
+            name="RouteFlat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("distance", models.IntegerField()),
+                ("source_id", models.BigIntegerField()),
+                ("source_name", models.CharField(max_length=255)),
+                ("source_city_id", models.BigIntegerField(null=True)),
+                ("source_city_name", models.CharField(max_length=100, null=True)),
+                ("source_country_name", models.CharField(max_length=100, null=True)),
+                ("destination_id", models.BigIntegerField()),
+                ("destination_name", models.CharField(max_length=255)),
+                ("destination_city_id", models.BigIntegerField(null=True)),
+                ("destination_city_name", models.CharField(max_length=100, null=True)),
+                (
+                    "destination_country_name",
+                    models.CharField(max_length=100, null=True),
+                ),
+            ],
+            options={
+                "db_table": "route_flat",
+                "managed": False,
+            },
+        ),
+    ]
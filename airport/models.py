@@ -2,7 +2,9 @@ import os
 import uuid
 
 from django.conf import settings
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models, connection
+from django.db.models.functions import TruncDate, Upper
 from django.utils.text import slugify
 from rest_framework.exceptions import ValidationError
 
@@ -32,6 +34,14 @@ class City(models.Model):
     def __str__(self):
         return f"City: {self.name}, Country: {self.country.name}"
 
+    class Meta:
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="city_name_trgm",
+            ),
+        ]
+
 
 class AirplaneType(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -82,6 +92,12 @@ class Airport(models.Model):
 
     class Meta:
         ordering = ("name",)
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="airport_name_trgm",
+            ),
+        ]
 
 
 class Route(models.Model):
@@ -104,6 +120,32 @@ class Route(models.Model):
         )
 
 
+class RouteFlat(models.Model):
+    """Read-only route row pre-joined with its airports, cities and countries"""
+    distance = models.IntegerField()
+    source_id = models.BigIntegerField()
+    source_name = models.CharField(max_length=255)
+    source_city_id = models.BigIntegerField(null=True)
+    source_city_name = models.CharField(max_length=100, null=True)
+    source_country_name = models.CharField(max_length=100, null=True)
+    destination_id = models.BigIntegerField()
+    destination_name = models.CharField(max_length=255)
+    destination_city_id = models.BigIntegerField(null=True)
+    destination_city_name = models.CharField(max_length=100, null=True)
+    destination_country_name = models.CharField(max_length=100, null=True)
+
+    @staticmethod
+    def refresh():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "REFRESH MATERIALIZED VIEW CONCURRENTLY route_flat"
+            )
+
+    class Meta:
+        managed = False
+        db_table = "route_flat"
+
+
 class Flight(models.Model):
     route = models.ForeignKey(
         Route,
@@ -118,6 +160,7 @@ class Flight(models.Model):
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
     crew = models.ManyToManyField(Crew, blank=True)
+    booked_seats = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return (
@@ -127,6 +170,16 @@ class Flight(models.Model):
 
     class Meta:
         ordering = ("-departure_time", "-arrival_time",)
+        indexes = [
+            models.Index(
+                fields=["-departure_time", "-arrival_time", "id"],
+                name="flight_departure_idx",
+            ),
+            models.Index(
+                TruncDate("departure_time"),
+                name="flight_dep_date_idx",
+            ),
+        ]
 
 
 class Order(models.Model):
@@ -1,4 +1,9 @@
+from collections import Counter
+
 from django.db import transaction
+from django.db.models import F
+from drf_serializer_cache import SerializerCacheMixin
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
@@ -8,6 +13,7 @@ from airport.models import (
     Airplane,
     Airport,
     Route,
+    RouteFlat,
     Flight,
     Ticket,
     Order,
@@ -61,6 +67,10 @@ class AirplaneImageSerializer(serializers.ModelSerializer):
         fields = ("id", "image")
 
 
+class AirplaneImageUrlSerializer(serializers.Serializer):
+    image = serializers.URLField(allow_null=True, read_only=True)
+
+
 class AirplaneListSerializer(AirplaneSerializer):
     airplane_type = AirplaneTypeSerializer(read_only=True)
 
@@ -87,9 +97,12 @@ class AirportSerializer(serializers.ModelSerializer):
         fields = ("id", "name", "closest_big_city",)
 
 
-class AirportListSerializer(AirportSerializer):
+class AirportListSerializer(SerializerCacheMixin, AirportSerializer):
     closest_big_city = CityListSerializer(read_only=True)
 
+    class Meta(AirportSerializer.Meta):
+        pass
+
 
 class RouteSerializer(serializers.ModelSerializer):
     class Meta:
@@ -97,10 +110,48 @@ class RouteSerializer(serializers.ModelSerializer):
         fields = ("id", "source", "destination", "distance",)
 
 
-class RouteListSerializer(RouteSerializer):
+class RouteListSerializer(SerializerCacheMixin, RouteSerializer):
     source = AirportListSerializer(read_only=True)
     destination = AirportListSerializer(read_only=True)
 
+    class Meta(RouteSerializer.Meta):
+        pass
+
+
+class RouteFlatSerializer(serializers.ModelSerializer):
+    """Render a RouteFlat row in the same shape as RouteListSerializer"""
+    source = serializers.SerializerMethodField()
+    destination = serializers.SerializerMethodField()
+
+    class Meta:
+        model = RouteFlat
+        fields = ("id", "source", "destination", "distance",)
+
+    @staticmethod
+    def airport_representation(route, prefix):
+        city_id = getattr(route, f"{prefix}_city_id")
+        closest_big_city = None
+        if city_id is not None:
+            closest_big_city = {
+                "id": city_id,
+                "name": getattr(route, f"{prefix}_city_name"),
+                "country": getattr(route, f"{prefix}_country_name"),
+            }
+
+        return {
+            "id": getattr(route, f"{prefix}_id"),
+            "name": getattr(route, f"{prefix}_name"),
+            "closest_big_city": closest_big_city,
+        }
+
+    @extend_schema_field(AirportListSerializer)
+    def get_source(self, route):
+        return self.airport_representation(route, "source")
+
+    @extend_schema_field(AirportListSerializer)
+    def get_destination(self, route):
+        return self.airport_representation(route, "destination")
+
 
 class TicketSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
@@ -147,7 +198,7 @@ class FlightListSerializer(FlightSerializer):
         )
 
 
-class FlightListDetailSerializer(FlightListSerializer):
+class FlightListDetailSerializer(SerializerCacheMixin, FlightListSerializer):
     count_free_seats = serializers.IntegerField(source="free_tickets_seat")
 
     class Meta:
@@ -181,10 +232,21 @@ class OrderSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         tickets_data = validated_data.pop("tickets")
         order = Order.objects.create(**validated_data)
-        for ticket_data in tickets_data:
-            Ticket.objects.create(order=order, **ticket_data)
+        tickets = Ticket.objects.bulk_create(
+            [Ticket(order=order, **ticket_data) for ticket_data in tickets_data]
+        )
+
+        # bulk_create doesn't send post_save, so update the counters here
+        booked_seats = Counter(ticket.flight_id for ticket in tickets)
+        for flight_id, count in booked_seats.items():
+            Flight.objects.filter(pk=flight_id).update(
+                booked_seats=F("booked_seats") + count
+            )
         return order
 
 
-class OrderListSerializer(OrderSerializer):
+class OrderListSerializer(SerializerCacheMixin, OrderSerializer):
     tickets = TicketListSerializer(many=True, read_only=True)
+
+    class Meta(OrderSerializer.Meta):
+        pass
@@ -0,0 +1,109 @@
+import logging
+import weakref
+
+from django.db import transaction, DatabaseError
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from airport.cache import invalidate_geo_cache
+from airport.models import (
+    Airport,
+    City,
+    Country,
+    Flight,
+    Route,
+    RouteFlat,
+    Ticket,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@receiver([post_save, post_delete], sender=Airport)
+@receiver([post_save, post_delete], sender=City)
+@receiver([post_save, post_delete], sender=Country)
+def invalidate_geo_cache_on_change(sender, **kwargs):
+    if kwargs.get("raw"):
+        return
+
+    # rotate only once the change is visible to other workers
+    transaction.on_commit(invalidate_geo_cache)
+
+
+def refresh_route_flat():
+    # the write is already committed, so a failed refresh must not fail
+    # the request; the refresh_route_flat command can be run to recover
+    try:
+        RouteFlat.refresh()
+    except DatabaseError:
+        logger.exception("Failed to refresh the route_flat view")
+
+
+def queue_route_flat_refresh():
+    """Refresh route_flat once the current transaction commits"""
+    connection = transaction.get_connection()
+    if getattr(connection, "route_flat_refresh_queued", False):
+        return
+
+    def refresh():
+        connection.route_flat_refresh_queued = False
+        refresh_route_flat()
+
+    connection.route_flat_refresh_queued = True
+    # a rollback discards the callback, which must not leave the flag set
+    weakref.finalize(
+        refresh, setattr, connection, "route_flat_refresh_queued", False
+    )
+    transaction.on_commit(refresh)
+
+
+@receiver([post_save, post_delete], sender=Route)
+@receiver([post_save, post_delete], sender=Airport)
+@receiver([post_save, post_delete], sender=City)
+@receiver([post_save, post_delete], sender=Country)
+def refresh_route_flat_on_change(sender, **kwargs):
+    # fixtures are followed by the refresh_route_flat command
+    if kwargs.get("raw"):
+        return
+
+    queue_route_flat_refresh()
+
+
+def change_flight_booked_seats(flight_id, delta):
+    flights = Flight.objects.filter(pk=flight_id)
+    if delta < 0:
+        flights = flights.filter(booked_seats__gte=-delta)
+    flights.update(booked_seats=F("booked_seats") + delta)
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_flight(sender, instance, raw, **kwargs):
+    if raw or instance.pk is None:
+        return
+
+    instance.previous_flight_id = (
+        Ticket.objects.filter(pk=instance.pk)
+        .values_list("flight_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Ticket)
+def increment_flight_booked_seats(sender, instance, created, raw, **kwargs):
+    # fixtures already contain the counted booked_seats
+    if raw:
+        return
+
+    previous_flight_id = getattr(instance, "previous_flight_id", None)
+
+    if created:
+        change_flight_booked_seats(instance.flight_id, 1)
+    elif previous_flight_id not in (None, instance.flight_id):
+        change_flight_booked_seats(previous_flight_id, -1)
+        change_flight_booked_seats(instance.flight_id, 1)
+
+
+@receiver(post_delete, sender=Ticket)
+def decrement_flight_booked_seats(sender, instance, **kwargs):
+    change_flight_booked_seats(instance.flight_id, -1)
@@ -1,3 +1,185 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, transaction
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.cache import get_geo_cache_version, invalidate_geo_cache
+from airport.models import (
+    Country,
+    City,
+    Airport,
+    Route,
+    AirplaneType,
+    Airplane,
+    Flight,
+    Order,
+    RouteFlat,
+    Ticket,
+)
+from airport.signals import refresh_route_flat
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class FlightBookedSeatsTests(TestCase):
+    def setUp(self):
+        country = Country.objects.create(name="Ukraine")
+        city = City.objects.create(name="Kyiv", country=country)
+        source = Airport.objects.create(name="Boryspil", closest_big_city=city)
+        destination = Airport.objects.create(name="Zhuliany", closest_big_city=city)
+        route = Route.objects.create(
+            source=source, destination=destination, distance=30
+        )
+        airplane_type = AirplaneType.objects.create(name="Boeing")
+        airplane = Airplane.objects.create(
+            name="737", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time="2024-01-11T18:00:00Z",
+            arrival_time="2024-01-11T19:00:00Z",
+        )
+        self.other_flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time="2024-01-12T18:00:00Z",
+            arrival_time="2024-01-12T19:00:00Z",
+        )
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass123"
+        )
+        self.order = Order.objects.create(user=self.user)
+
+    def assert_booked_seats(self, flight, expected):
+        flight.refresh_from_db()
+        self.assertEqual(flight.booked_seats, expected)
+
+    def test_ticket_create_increments_booked_seats(self):
+        Ticket.objects.create(row=1, seat=1, flight=self.flight, order=self.order)
+        Ticket.objects.create(row=1, seat=2, flight=self.flight, order=self.order)
+
+        self.assert_booked_seats(self.flight, 2)
+        self.assert_booked_seats(self.other_flight, 0)
+
+    def test_ticket_delete_decrements_booked_seats(self):
+        ticket = Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=self.order
+        )
+        Ticket.objects.create(row=1, seat=2, flight=self.flight, order=self.order)
+
+        ticket.delete()
+        self.assert_booked_seats(self.flight, 1)
+
+        self.order.delete()
+        self.assert_booked_seats(self.flight, 0)
+
+    def test_ticket_resave_keeps_booked_seats(self):
+        ticket = Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=self.order
+        )
+        ticket.seat = 2
+        ticket.save()
+
+        self.assert_booked_seats(self.flight, 1)
+
+    def test_ticket_move_between_flights(self):
+        ticket = Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=self.order
+        )
+        Ticket.objects.create(row=1, seat=2, flight=self.flight, order=self.order)
+
+        ticket.flight = self.other_flight
+        ticket.save()
+
+        self.assert_booked_seats(self.flight, 1)
+        self.assert_booked_seats(self.other_flight, 1)
+
+    def test_raw_ticket_save_is_not_counted(self):
+        ticket = Ticket(row=1, seat=1, flight=self.flight, order=self.order)
+        ticket.save_base(raw=True)
+
+        self.assert_booked_seats(self.flight, 0)
+
+    def test_order_create_counts_bulk_created_tickets(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": 1, "flight": self.flight.id},
+                {"row": 1, "seat": 2, "flight": self.flight.id},
+                {"row": 1, "seat": 1, "flight": self.other_flight.id},
+            ]
+        }
+
+        response = client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assert_booked_seats(self.flight, 2)
+        self.assert_booked_seats(self.other_flight, 1)
+
+
+class RouteFlatRefreshTests(TestCase):
+    @mock.patch.object(RouteFlat, "refresh")
+    def test_refresh_runs_once_per_transaction(self, refresh):
+        with self.captureOnCommitCallbacks(execute=True):
+            country = Country.objects.create(name="Ukraine")
+            city = City.objects.create(name="Kyiv", country=country)
+            source = Airport.objects.create(
+                name="Boryspil", closest_big_city=city
+            )
+            destination = Airport.objects.create(
+                name="Zhuliany", closest_big_city=city
+            )
+            Route.objects.create(
+                source=source, destination=destination, distance=30
+            )
+
+        refresh.assert_called_once_with()
+
+    @mock.patch.object(RouteFlat, "refresh")
+    def test_refresh_is_queued_again_after_rollback(self, refresh):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(DatabaseError):
+                with transaction.atomic():
+                    Country.objects.create(name="Ukraine")
+                    raise DatabaseError("rollback")
+
+            Country.objects.create(name="Poland")
+
+        refresh.assert_called_once_with()
+
+    @mock.patch.object(RouteFlat, "refresh")
+    def test_raw_save_does_not_refresh(self, refresh):
+        with self.captureOnCommitCallbacks(execute=True):
+            Country(name="Ukraine").save_base(raw=True)
+
+        refresh.assert_not_called()
+
+    def test_failed_refresh_is_logged(self):
+        with mock.patch.object(
+            RouteFlat, "refresh", side_effect=DatabaseError("locked")
+        ):
+            with self.assertLogs("airport.signals", level="ERROR"):
+                refresh_route_flat()
+
+
+class GeoCacheInvalidationTests(TestCase):
+    def test_cache_is_invalidated_after_commit(self):
+        version = get_geo_cache_version()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Country.objects.create(name="Ukraine")
+
+        self.assertEqual(get_geo_cache_version(), version)
+        self.assertIn(invalidate_geo_cache, callbacks)
+
+    def test_raw_save_does_not_invalidate_cache(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            Country(name="Ukraine").save_base(raw=True)
 
-# Create your tests here.
+        self.assertNotIn(invalidate_geo_cache, callbacks)
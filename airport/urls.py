@@ -14,15 +14,15 @@ from airport.views import (
 )
 
 router = routers.DefaultRouter()
-router.register("crews", CrewViewSet)
-router.register("airplane_types", AirplaneTypeViewSet)
-router.register("airplanes", AirplaneViewSet)
-router.register("airports", AirportViewSet)
-router.register("routes", RouteViewSet)
-router.register("flights", FlightViewSet)
-router.register("orders", OrderViewSet)
-router.register("cities", CityViewSet)
-router.register("countries", CountryViewSet)
+router.register("crews", CrewViewSet, basename="crew")
+router.register("airplane_types", AirplaneTypeViewSet, basename="airplanetype")
+router.register("airplanes", AirplaneViewSet, basename="airplane")
+router.register("airports", AirportViewSet, basename="airport")
+router.register("routes", RouteViewSet, basename="route")
+router.register("flights", FlightViewSet, basename="flight")
+router.register("orders", OrderViewSet, basename="order")
+router.register("cities", CityViewSet, basename="city")
+router.register("countries", CountryViewSet, basename="country")
 
 urlpatterns = [
     path("", include(router.urls))
@@ -1,21 +1,28 @@
-from datetime import datetime
+from datetime import date
 
-from django.db.models import F, Count
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Prefetch
+from drf_orjson_renderer.renderers import ORJSONRenderer
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 
+from airport.cache import get_geo_cache_version, GEO_CACHE_TIMEOUT
 from airport.models import (
     Crew,
     AirplaneType,
     Airplane,
     Airport,
     Route,
+    RouteFlat,
     Flight,
     Order,
+    Ticket,
     Country,
     City
 )
@@ -29,6 +36,7 @@ from airport.serializers import (
     FlightSerializer,
     AirplaneListSerializer,
     RouteListSerializer,
+    RouteFlatSerializer,
     OrderSerializer,
     OrderListSerializer,
     AirportListSerializer,
@@ -36,11 +44,43 @@ from airport.serializers import (
     CitySerializer,
     CityListSerializer,
     AirplaneImageSerializer,
+    AirplaneImageUrlSerializer,
     AirplaneDetailSerializer,
     FlightListDetailSerializer,
 )
 
 
+class ActionSerializerMixin:
+    """
+    Pick the serializer for the current action from `action_serializers`,
+    falling back to `serializer_class`.
+    """
+    action_serializers = {}
+
+    def get_serializer_class(self):
+        return self.action_serializers.get(self.action, self.serializer_class)
+
+
+class CachedListMixin:
+    """
+    Serve list responses from the cache until an airport,
+    city or country is changed.
+    """
+
+    def list(self, request, *args, **kwargs):
+        cache_key = (
+            f"{self.basename}:list:"
+            f"{get_geo_cache_version()}:{request.get_full_path()}"
+        )
+        data = cache.get(cache_key)
+
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, data, GEO_CACHE_TIMEOUT)
+
+        return Response(data)
+
+
 class CrewViewSet(viewsets.ModelViewSet):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
@@ -53,24 +93,25 @@ class AirplaneTypeViewSet(viewsets.ModelViewSet):
     permission_classes = (IsAdminUser,)
 
 
-class AirplaneViewSet(viewsets.ModelViewSet):
+class AirplaneViewSet(ActionSerializerMixin, viewsets.ModelViewSet):
     queryset = Airplane.objects.select_related("airplane_type")
     serializer_class = AirplaneSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    action_serializers = {
+        "list": AirplaneListSerializer,
+        "retrieve": AirplaneDetailSerializer,
+        "upload_image": AirplaneImageSerializer,
+    }
 
-    def get_serializer_class(self):
-        serializer = self.serializer_class
-        if self.action == "list":
-            return AirplaneListSerializer
-
-        if self.action == "retrieve":
-            return AirplaneDetailSerializer
+    def get_queryset(self):
+        queryset = self.queryset.all()
 
-        if self.action == "upload_image":
-            return AirplaneImageSerializer
+        if self.action == "list":
+            queryset = queryset.defer("image")
 
-        return serializer
+        return queryset
 
+    @extend_schema(responses={status.HTTP_200_OK: AirplaneImageUrlSerializer})
     @action(methods=["POST"], detail=True, url_path="upload-image", )
     def upload_image(self, request, pk=None):
         item = self.get_object()
@@ -78,20 +119,31 @@ class AirplaneViewSet(viewsets.ModelViewSet):
 
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            image_url = (
+                request.build_absolute_uri(item.image.url)
+                if item.image else None
+            )
+            return Response({"image": image_url}, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class AirportViewSet(viewsets.ModelViewSet):
+class AirportViewSet(
+    ActionSerializerMixin, CachedListMixin, viewsets.ModelViewSet
+):
     queryset = Airport.objects.select_related(
         "closest_big_city__country",
     )
     serializer_class = AirportSerializer
     permission_classes = (IsAdminOrReadOnly,)
+    renderer_classes = (ORJSONRenderer, BrowsableAPIRenderer)
+    action_serializers = {
+        "list": AirportListSerializer,
+        "retrieve": AirportListSerializer,
+    }
 
     def get_queryset(self):
-        queryset = self.queryset
+        queryset = self.queryset.all()
 
         airport_name = self.request.query_params.get("airport_name")
         city = self.request.query_params.get("city")
@@ -102,13 +154,7 @@ class AirportViewSet(viewsets.ModelViewSet):
         if city:
             queryset = queryset.filter(closest_big_city__name__icontains=city)
 
-        return queryset.distinct()
-
-    def get_serializer_class(self):
-        if self.action in ("list", "retrieve"):
-            return AirportListSerializer
-
-        return self.serializer_class
+        return queryset
 
     # only for documentation
     @extend_schema(
@@ -129,18 +175,26 @@ class AirportViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-def params_to_ints(queryset: str) -> list:
-    """convert a list of string ids to a list of integer"""
-    return [int(str_id) for str_id in queryset.split(",")]
+def params_to_ints(queryset: str) -> tuple[int, ...]:
+    """convert a list of string ids to a tuple of integer"""
+    try:
+        return tuple(map(int, queryset.split(",")))
+    except ValueError:
+        return ()
 
 
-class PaginationClass(PageNumberPagination):
+class PaginationClass(CursorPagination):
     page_size = 5
     page_size_query_param = "page_size"
     max_page_size = 100
+    ordering = "-id"
+
 
+class FlightPaginationClass(PaginationClass):
+    ordering = "-departure_time"
 
-class RouteViewSet(viewsets.ModelViewSet):
+
+class RouteViewSet(ActionSerializerMixin, viewsets.ModelViewSet):
     queryset = Route.objects.select_related(
         "source__closest_big_city__country",
         "destination__closest_big_city__country",
@@ -148,30 +202,31 @@ class RouteViewSet(viewsets.ModelViewSet):
     serializer_class = RouteSerializer
     pagination_class = PaginationClass
     permission_classes = (IsAdminOrReadOnly,)
+    renderer_classes = (ORJSONRenderer, BrowsableAPIRenderer)
+    action_serializers = {
+        "list": RouteFlatSerializer,
+        "retrieve": RouteFlatSerializer,
+    }
 
     def get_queryset(self):
-        queryset = self.queryset
+        queryset = self.queryset.all()
+
+        if self.action in ("list", "retrieve"):
+            queryset = RouteFlat.objects.all()
 
         source = self.request.query_params.get("source")
         destination = self.request.query_params.get("destination")
 
         if source:
             source_ids = params_to_ints(source)
-            queryset = queryset.filter(source__id__in=source_ids)
+            queryset = queryset.filter(source_id__in=source_ids)
 
         if destination:
             destination_ids = params_to_ints(destination)
-            queryset = queryset.filter(destination__id__in=destination_ids)
+            queryset = queryset.filter(destination_id__in=destination_ids)
 
         return queryset
 
-    def get_serializer_class(self):
-        serializer = self.serializer_class
-        if self.action in ("list", "retrieve"):
-            return RouteListSerializer
-
-        return serializer
-
     # only for documentation
     @extend_schema(
         parameters=[
@@ -191,18 +246,23 @@ class RouteViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class FlightViewSet(viewsets.ModelViewSet):
+class FlightViewSet(ActionSerializerMixin, viewsets.ModelViewSet):
     queryset = Flight.objects.select_related(
         "route__source__closest_big_city__country",
         "route__destination__closest_big_city__country",
         "airplane__airplane_type",
     ).prefetch_related("crew")
     serializer_class = FlightSerializer
-    pagination_class = PaginationClass
+    pagination_class = FlightPaginationClass
     permission_classes = (IsAdminOrReadOnly,)
+    renderer_classes = (ORJSONRenderer, BrowsableAPIRenderer)
+    action_serializers = {
+        "list": FlightListDetailSerializer,
+        "retrieve": FlightListDetailSerializer,
+    }
 
     def get_queryset(self):
-        queryset = self.queryset
+        queryset = self.queryset.all()
 
         route = self.request.query_params.get("route")
         departure_time = self.request.query_params.get("departure_time")
@@ -212,23 +272,23 @@ class FlightViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(route__id__in=route_ids)
 
         if departure_time:
-            departure_time = datetime.strptime(departure_time, "%Y-%m-%d").date()
-            queryset = queryset.filter(departure_time__date=departure_time)
+            try:
+                departure_date = date.fromisoformat(departure_time)
+            except ValueError:
+                departure_date = None
+
+            if departure_date:
+                queryset = queryset.filter(departure_time__date=departure_date)
 
         if self.action in ("list", "retrieve"):
-            queryset = queryset.annotate(
-                free_tickets_seat=F("airplane__rows") * F("airplane__seats_in_row") - Count("tickets")
+            queryset = queryset.defer("airplane__image").annotate(
+                free_tickets_seat=(
+                    F("airplane__rows") * F("airplane__seats_in_row")
+                    - F("booked_seats")
+                )
             )
         return queryset
 
-    def get_serializer_class(self):
-        serializer = self.serializer_class
-
-        if self.action in ("list", "retrieve"):
-            return FlightListDetailSerializer
-
-        return serializer
-
     # only for documentation
     @extend_schema(
         parameters=[
@@ -251,46 +311,49 @@ class FlightViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(ActionSerializerMixin, viewsets.ModelViewSet):
     queryset = Order.objects.prefetch_related(
-        "tickets__flight__route__source__closest_big_city__country",
-        "tickets__flight__route__destination__closest_big_city__country",
-        "tickets__flight__crew",
-        "tickets__flight__airplane__airplane_type"
-
+        Prefetch(
+            "tickets",
+            queryset=Ticket.objects.select_related(
+                "flight__route__source__closest_big_city__country",
+                "flight__route__destination__closest_big_city__country",
+                "flight__airplane__airplane_type",
+            ).prefetch_related("flight__crew"),
+        )
     )
     serializer_class = OrderSerializer
     pagination_class = PaginationClass
     permission_classes = (IsAuthenticated,)
+    renderer_classes = (ORJSONRenderer, BrowsableAPIRenderer)
+    action_serializers = {
+        "list": OrderListSerializer,
+        "retrieve": OrderListSerializer,
+    }
 
     def get_queryset(self):
-        queryset = self.queryset
-        queryset = queryset.filter(user=self.request.user).distinct()
+        queryset = self.queryset.all()
+        queryset = queryset.filter(user=self.request.user)
         return queryset
 
-    def get_serializer_class(self):
-        if self.action in ("list", "retrieve"):
-            return OrderListSerializer
-
-        return OrderSerializer
-
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            serializer.save(user=self.request.user)
 
 
-class CountryViewSet(viewsets.ModelViewSet):
+class CountryViewSet(CachedListMixin, viewsets.ModelViewSet):
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
     permission_classes = (IsAdminUser,)
 
 
-class CityViewSet(viewsets.ModelViewSet):
+class CityViewSet(
+    ActionSerializerMixin, CachedListMixin, viewsets.ModelViewSet
+):
     queryset = City.objects.select_related("country")
     serializer_class = CitySerializer
     permission_classes = (IsAdminUser,)
-
-    def get_serializer_class(self):
-        if self.action in ("list", "retrieve"):
-            return CityListSerializer
-
-        return self.serializer_class
+    action_serializers = {
+        "list": CityListSerializer,
+        "retrieve": CityListSerializer,
+    }
@@ -5,4 +5,5 @@ set -o errexit
 pip install -r requirements.txt
 
 python manage.py migrate
-python manage.py loaddata data_base.json
\ No newline at end of file
+python manage.py loaddata data_base.json
+python manage.py refresh_route_flat
\ No newline at end of file